@@ -0,0 +1,254 @@
+"""Binance API access shared by the stdio and HTTP MCP servers"""
+
+import asyncio
+import copy
+import datetime
+import httpx
+import orjson
+from typing import Any, Callable
+from functools import lru_cache, partial, wraps
+from urllib.parse import urlencode
+import inspect
+import math
+import time
+
+BINANCE_API_URL = "https://api.binance.us"
+_PRICE_PATH = "/api/v3/ticker/price"
+_PRICE_24HR_PATH = "/api/v3/ticker/24hr"
+_ROLLING_WINDOW_PATH = "/api/v3/ticker"
+
+# Shared HTTP/2 client so concurrent tool calls are multiplexed over one connection.
+# Headers are fixed up front and failed connects are retried at the transport level.
+_client = httpx.AsyncClient(
+    base_url=BINANCE_API_URL,
+    headers={"Accept": "application/json"},
+    timeout=5.0,
+    transport=httpx.AsyncHTTPTransport(http2=True, retries=3),
+)
+
+# Default symbol mappings
+SYMBOL_MAPPINGS = {
+    "btc": "BTCUSDT",
+    "bitcoin": "BTCUSDT",
+    "eth": "ETHUSDT",
+    "ethereum": "ETHUSDT",
+    "sol": "SOLUSDT",
+    "solana": "SOLUSDT",
+    "doge": "DOGEUSDT",
+    "shiba": "SHIBUSDT",
+    "xrp": "XRPUSDT",
+    "ada": "ADAUSDT",
+    "dot": "DOTUSDT",
+    "link": "LINKUSDT",
+    "ltc": "LTCUSDT",
+    "xlm": "XLMUSDT",
+    "eos": "EOSUSDT",
+    "bnb": "BNBUSDT",
+    "matic": "MATICUSDT",
+    "avax": "AVAXUSDT",
+    "algo": "ALGOUSDT",
+    "ftt": "FTTUSDT",
+    "mana": "MANAUSDT",
+    "uni": "UNIUSDT",
+    "xmr": "XMRUSDT",
+    "xem": "XEMUSDT",
+}
+
+
+def symbol_map_csv(symbol_mappings: dict[str, str]) -> str:
+    """Render symbol mappings in the symbol_map.csv format"""
+    return "crypto_name,symbol\n" + "".join(
+        f"{crypto_name},{symbol}\n" for crypto_name, symbol in symbol_mappings.items()
+    )
+
+
+def log_timestamp(timestamp_ns: int) -> datetime.datetime:
+    """Convert a raw ``time.time_ns()`` log timestamp to a local datetime"""
+    seconds, nanoseconds = divmod(timestamp_ns, 1_000_000_000)
+    return datetime.datetime.fromtimestamp(seconds).replace(
+        microsecond=nanoseconds // 1000
+    )
+
+
+def _ticker_urls(path: str, symbols) -> dict[str, str]:
+    """Build the request URL for each known symbol"""
+    return {symbol: f"{path}?symbol={symbol}" for symbol in set(symbols)}
+
+
+def _ticker_url(urls: dict[str, str], path: str, symbol: str) -> str:
+    """Get the prebuilt URL for a known symbol, or encode the query for others"""
+    return urls.get(symbol) or f"{path}?{urlencode({'symbol': symbol})}"
+
+
+# Agent turns often repeat the same tool call within seconds; serve those from memory
+PRICE_CACHE_TTL = 2.0  # seconds
+PRICE_CACHE_SIZE = 64
+
+
+def ttl_cached(ttl: float, maxsize: int = PRICE_CACHE_SIZE):
+    """Cache an async function's result per arguments for ``ttl`` seconds
+
+    Concurrent calls with the same arguments share one in-flight request, and
+    failed calls are not cached. Each caller gets a shallow copy of the result,
+    so mutating a returned dict does not leak into the cache.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        # key -> (expiry, task); in-flight tasks never expire until they settle
+        cache: dict[tuple, tuple[float, asyncio.Task]] = {}
+
+        def settle(key, task):
+            if cache.get(key, (None, None))[1] is not task:
+                return  # already evicted or replaced
+            if task.cancelled() or task.exception() is not None:
+                del cache[key]
+            else:
+                cache[key] = (time.monotonic() + ttl, task)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = tuple(bound.arguments.items())
+
+            cached = cache.get(key)
+            if cached is None or cached[0] <= time.monotonic():
+                task = asyncio.ensure_future(func(*args, **kwargs))
+                cache.pop(key, None)
+                cache[key] = (math.inf, task)
+                task.add_done_callback(partial(settle, key))
+                if len(cache) > maxsize:
+                    del cache[next(iter(cache))]
+            else:
+                task = cached[1]
+
+            # shield so one caller being cancelled does not cancel the shared call
+            return copy.copy(await asyncio.shield(task))
+
+        return wrapper
+
+    return decorator
+
+
+def register_price_tools(
+    mcp, symbol_mappings: dict[str, str], log_activity: Callable[[str], None]
+):
+    """Register the Binance price resource and tools on an MCP server
+
+    Args:
+        mcp: The FastMCP server to register on
+        symbol_mappings: Lower-cased crypto names mapped to Binance symbols
+        log_activity: The server's activity logger
+    """
+    # Request URLs for the known symbols are built once instead of on every call
+    price_urls = _ticker_urls(_PRICE_PATH, symbol_mappings.values())
+    price_24hr_urls = _ticker_urls(_PRICE_24HR_PATH, symbol_mappings.values())
+
+    @lru_cache(maxsize=256)
+    def get_symbol_from_input(name: str) -> str:
+        """Get symbol from input name using the server's symbol mappings"""
+        # the upper-cased fallback is only built when the mapping lookup misses
+        return symbol_mappings.get(name.lower()) or name.upper()
+
+    @ttl_cached(PRICE_CACHE_TTL)
+    async def _fetch_price(symbol: str) -> str:
+        """Fetch the current price of a crypto asset (shared by the tool and resource)"""
+        symbol = get_symbol_from_input(symbol)
+        response = await _client.get(_ticker_url(price_urls, _PRICE_PATH, symbol))
+        if response.status_code != 200:
+            log_activity(
+                f"Error getting price for {symbol}: {response.status_code} {response.text}"
+            )
+            raise Exception(
+                f"Error getting price for {symbol}: {response.status_code} {response.text}"
+            )
+        else:
+            price = orjson.loads(response.content)["price"]
+            log_activity(f"Successfully got the current price for {symbol}: {price}")
+        return f"The current price of {symbol} is {price}"
+
+    # https://github.com/modelcontextprotocol/python-sdk?tab=readme-ov-file#resources
+    # example: resource://crypto_price/BTCUSDT
+    @mcp.resource("resource://crypto_price/{symbol}")
+    async def get_crypto_price(symbol: str) -> str:
+        """
+        Get the current price of a crypto asset from Binance
+        """
+        return await _fetch_price(symbol)
+
+    @mcp.tool()
+    async def get_price(symbol: str) -> Any:
+        """
+        Get the current price of a crypto asset from Binance
+
+        Args:
+            symbol(str): The symbol of the crypto asset to get the price of
+
+        Returns:
+            The current price of the crypto asset
+        """
+        return await _fetch_price(symbol)
+
+    @mcp.tool()
+    @ttl_cached(PRICE_CACHE_TTL)
+    async def get_price_24hr_change(symbol: str) -> Any:
+        """
+        Get the price change of a crypto asset from Binance
+
+        Args:
+            symbol(str): The symbol of the crypto asset to get the price change of
+        """
+        symbol = get_symbol_from_input(symbol)
+        response = await _client.get(
+            _ticker_url(price_24hr_urls, _PRICE_24HR_PATH, symbol)
+        )
+        if response.status_code != 200:
+            log_activity(
+                f"Error getting price change for {symbol}: {response.status_code} {response.text}"
+            )
+            raise Exception(
+                f"Error getting price change for {symbol}: {response.status_code} {response.text}"
+            )
+        else:
+            data = orjson.loads(response.content)
+            price_change = data["priceChange"]
+            price_change_percent = data["priceChangePercent"]
+
+            log_activity(
+                f"Successfully got the price change for {symbol}: {price_change} ({price_change_percent}%)"
+            )
+        return data
+
+    @mcp.tool()
+    @ttl_cached(PRICE_CACHE_TTL)
+    async def get_rolling_windows_price(symbol: str, window: str = "1d") -> Any:
+        """
+        Get the rolling windows price of a crypto asset from Binance
+
+        Args:
+            symbol(str): The symbol of the crypto asset to get the rolling windows price of
+            window(str): The window size of the rolling windows price
+                - Minutes: 1m, 2m, ..., 59m
+                - Hours: 1h, 2h, ..., 23h
+                - Days: 1d, 2d, ..., 7d
+        """
+        symbol = get_symbol_from_input(symbol)
+        response = await _client.get(
+            _ROLLING_WINDOW_PATH, params={"symbol": symbol, "windowSize": window}
+        )
+        if response.status_code != 200:
+            log_activity(
+                f"Error getting the price change for {symbol} in the window {window}: {response.status_code} {response.text}"
+            )
+            raise Exception(
+                f"Error getting the price change for {symbol} in the window {window}: {response.status_code} {response.text}"
+            )
+        else:
+            data = orjson.loads(response.content)
+            price_change = data["priceChange"]
+            price_change_percent = data["priceChangePercent"]
+            log_activity(
+                f"Successfully got the price change for {symbol} in the window {window}: {price_change} ({price_change_percent}%)"
+            )
+        return data
@@ -1,21 +1,28 @@
-import datetime
 from pathlib import Path
 from mcp.server.fastmcp import FastMCP
-import requests
-from typing import Any
 import csv
+import mmap
+import os
+import atexit
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from binance_api import (
+    SYMBOL_MAPPINGS,
+    log_timestamp,
+    register_price_tools,
+    symbol_map_csv,
+)
 
 # set a folder to record the log
 BASE_FOLDER = Path(__file__).parent.absolute()
 LOG_FILE = BASE_FOLDER / "activity.log"
 SYMBOL_MAP_FILE = BASE_FOLDER / "symbol_map.csv"
 
-
 mcp = FastMCP("binance-mcp")
 
-# Cache for symbol mappings to avoid reading CSV repeatedly
-_symbol_cache = None
-
 
 # Initialize files at module load time
 def _initialize_files():
@@ -26,89 +33,136 @@ def _initialize_files():
 
     # Create symbol map file if it doesn't exist
     if not Path(SYMBOL_MAP_FILE).exists():
-        symbol_mappings = [
-            ("btc", "BTCUSDT"),
-            ("bitcoin", "BTCUSDT"),
-            ("eth", "ETHUSDT"),
-            ("ethereum", "ETHUSDT"),
-            ("sol", "SOLUSDT"),
-            ("solana", "SOLUSDT"),
-            ("doge", "DOGEUSDT"),
-            ("shiba", "SHIBUSDT"),
-            ("xrp", "XRPUSDT"),
-            ("ada", "ADAUSDT"),
-            ("dot", "DOTUSDT"),
-            ("link", "LINKUSDT"),
-            ("ltc", "LTCUSDT"),
-            ("xlm", "XLMUSDT"),
-            ("eos", "EOSUSDT"),
-            ("bnb", "BNBUSDT"),
-            ("matic", "MATICUSDT"),
-            ("avax", "AVAXUSDT"),
-            ("algo", "ALGOUSDT"),
-            ("ftt", "FTTUSDT"),
-            ("mana", "MANAUSDT"),
-            ("uni", "UNIUSDT"),
-            ("xmr", "XMRUSDT"),
-            ("xem", "XEMUSDT"),
-        ]
-
         with open(SYMBOL_MAP_FILE, "w") as f:
-            f.write("crypto_name,symbol\n")
-            for crypto_name, symbol in symbol_mappings:
-                f.write(f"{crypto_name},{symbol}\n")
+            f.write(symbol_map_csv(SYMBOL_MAPPINGS))
 
 
 # Initialize files when module is loaded
 _initialize_files()
 
+# Log entries are queued on the hot path and written to disk in batches through
+# a single buffered handle that stays open for the lifetime of the server
+LOG_FLUSH_INTERVAL = 0.1  # seconds
+_log_queue = deque()
+_log_lock = threading.Lock()
+_log_file = open(LOG_FILE, "a", buffering=64 * 1024)
+
+
+def log_activity(message: str):
+    """Queue an activity log entry for the background writer"""
+    # Store the raw timestamp; the writer thread formats it off the hot path
+    _log_queue.append((time.time_ns(), message))
+
+
+def _format_log_entry(timestamp_ns: int, message: str) -> str:
+    """Format a log entry as a log file line"""
+    return f"{log_timestamp(timestamp_ns)}: {message}\n"
+
+
+def flush_logs():
+    """Write all queued activity log entries to the log file"""
+    with _log_lock:
+        if not _log_queue or _log_file.closed:
+            return
+        lines = []
+        while _log_queue:
+            lines.append(_format_log_entry(*_log_queue.popleft()))
+        _log_file.write("".join(lines))
+        _log_file.flush()
+
+
+def _close_log_file():
+    """Flush pending log entries and close the log file at exit"""
+    flush_logs()
+    with _log_lock:
+        _log_file.close()
+
+
+def _log_writer():
+    while True:
+        time.sleep(LOG_FLUSH_INTERVAL)
+        flush_logs()
 
-def load_symbol_mappings():
-    """Load symbol mappings from CSV file with caching"""
-    global _symbol_cache
 
-    if _symbol_cache is not None:
-        return _symbol_cache
+threading.Thread(target=_log_writer, name="activity-log-writer", daemon=True).start()
+atexit.register(_close_log_file)
 
-    _symbol_cache = {}
 
-    if Path(SYMBOL_MAP_FILE).exists():
-        try:
-            with open(SYMBOL_MAP_FILE, "r") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    _symbol_cache[row["crypto_name"].lower()] = row["symbol"]
-        except Exception as e:
-            with open(LOG_FILE, "a") as log_f:
-                log_f.write(
-                    f"{datetime.datetime.now()}: Error reading symbol_map.csv: {e}\n"
-                )
+def load_symbol_mappings() -> dict[str, str]:
+    """Load symbol mappings from the CSV file"""
+    symbol_mappings = {}
 
-    return _symbol_cache
+    try:
+        with open(SYMBOL_MAP_FILE, "r") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                symbol_mappings[row["crypto_name"].lower()] = row["symbol"]
+    except Exception as e:
+        log_activity(f"Error reading symbol_map.csv: {e}")
 
+    return symbol_mappings
 
-def get_symbol_from_input(name: str) -> str:
-    """Get symbol from input name, first checking CSV mappings, then fallback logic"""
-    # Load mappings from CSV
-    symbol_mappings = load_symbol_mappings()
 
-    # Check CSV mappings first
-    if name.lower() in symbol_mappings:
-        return symbol_mappings[name.lower()]
-    else:
-        return name.upper()
+# Symbol mappings are read once at import, so lookups never touch the CSV file
+_SYMBOLS = load_symbol_mappings()
+_SYMBOL_MAP_CSV = symbol_map_csv(_SYMBOLS)
 
 
 @mcp.resource("file://symbol_map.csv")
 def get_symbol_map() -> str:
-    with open(SYMBOL_MAP_FILE, "r") as f:
-        return f.read()
+    return _SYMBOL_MAP_CSV
+
+
+# The activity.log resource only returns the tail; read_log_page pages the full log
+LOG_TAIL_BYTES = 64 * 1024
+
+
+@contextmanager
+def _map_log_file():
+    """Memory-map the log file read-only (an empty file yields empty bytes)"""
+    flush_logs()
+    with open(LOG_FILE, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def _line_start(log, offset: int) -> int:
+    """Move a byte offset forward to the start of the next complete log line"""
+    if offset <= 0:
+        return 0
+    newline = log.find(b"\n", offset - 1)
+    return len(log) if newline == -1 else newline + 1
 
 
 @mcp.resource("file://activity.log")
 def read_log() -> str:
-    with open(LOG_FILE, "r") as f:
-        return f.read()
+    """Get the most recent activity log entries (last 64KB of the log file)"""
+    with _map_log_file() as log:
+        # Drop the partial line at the start of the tail
+        start = _line_start(log, len(log) - LOG_TAIL_BYTES)
+        return log[start:].decode("utf-8", "replace")
+
+
+@mcp.tool()
+def read_log_page(page: int = 0, page_size: int = LOG_TAIL_BYTES) -> str:
+    """
+    Read a page of the full activity log, oldest entries first
+
+    Pages hold whole log lines: a line belongs to the page its first byte falls in.
+
+    Args:
+        page(int): The zero-based page number
+        page_size(int): The page size in bytes (1KB-1MB)
+    """
+    page = max(0, page)
+    page_size = max(1024, min(page_size, 1024 * 1024))  # Clamp between 1KB-1MB
+    with _map_log_file() as log:
+        start = _line_start(log, page * page_size)
+        end = _line_start(log, (page + 1) * page_size)
+        return log[start:end].decode("utf-8", "replace")
 
 
 @mcp.prompt()
@@ -169,110 +223,7 @@ def crypto_summary(cryptos: str) -> str:
             """
 
 
-# https://github.com/modelcontextprotocol/python-sdk?tab=readme-ov-file#resources
-# example: resource://crypto_price/BTCUSDT
-@mcp.resource("resource://crypto_price/{symbol}")
-def get_crypto_price(symbol: str) -> str:
-    """
-    Get the current price of a crypto asset from Binance
-    """
-    return get_price(symbol)
-
-
-@mcp.tool()
-def get_price(symbol: str) -> Any:
-    """
-    Get the current price of a crypto asset from Binance
-
-    Args:
-        symbol(str): The symbol of the crypto asset to get the price of
-
-    Returns:
-        The current price of the crypto asset
-    """
-    symbol = get_symbol_from_input(symbol)
-    url = f"https://api.binance.us/api/v3/ticker/price?symbol={symbol}"
-    response = requests.get(url)
-    if response.status_code != 200:
-        with open(LOG_FILE, "a") as f:
-            f.write(
-                f"{datetime.datetime.now()}: Error getting price for {symbol}: {response.status_code} {response.text}\n"
-            )
-        raise Exception(
-            f"Error getting price for {symbol}: {response.status_code} {response.text}"
-        )
-    else:
-        price = response.json()["price"]
-        with open(LOG_FILE, "a") as f:
-            f.write(
-                f"{datetime.datetime.now()}: Successfully got the current price for {symbol}: {price}\n"
-            )
-    return f"The current price of {symbol} is {price}"
-
-
-@mcp.tool()
-def get_price_24hr_change(symbol: str) -> Any:
-    """
-    Get the price change of a crypto asset from Binance
-
-    Args:
-        symbol(str): The symbol of the crypto asset to get the price change of
-    """
-    symbol = get_symbol_from_input(symbol)
-    url = f"https://api.binance.us/api/v3/ticker/24hr?symbol={symbol}"
-    response = requests.get(url)
-    if response.status_code != 200:
-        with open(LOG_FILE, "a") as f:
-            f.write(
-                f"{datetime.datetime.now()}: Error getting price change for {symbol}: {response.status_code} {response.text}\n"
-            )
-        raise Exception(
-            f"Error getting price change for {symbol}: {response.status_code} {response.text}"
-        )
-    else:
-        data = response.json()
-        price_change = data["priceChange"]
-        price_change_percent = data["priceChangePercent"]
-
-        with open(LOG_FILE, "a") as f:
-            f.write(
-                f"{datetime.datetime.now()}: Successfully got the price change for {symbol}: {price_change} ({price_change_percent}%)\n"
-            )
-    return data
-
-
-@mcp.tool()
-def get_rolling_windows_price(symbol: str, window: str = "1d") -> Any:
-    """
-    Get the rolling windows price of a crypto asset from Binance
-
-    Args:
-        symbol(str): The symbol of the crypto asset to get the rolling windows price of
-        window(str): The window size of the rolling windows price
-            - Minutes: 1m, 2m, ..., 59m
-            - Hours: 1h, 2h, ..., 23h
-            - Days: 1d, 2d, ..., 7d
-    """
-    symbol = get_symbol_from_input(symbol)
-    url = f"https://api.binance.us/api/v3/ticker?symbol={symbol}&windowSize={window}"
-    response = requests.get(url)
-    if response.status_code != 200:
-        with open(LOG_FILE, "a") as f:
-            f.write(
-                f"{datetime.datetime.now()}: Error getting the price change for {symbol} in the window {window}: {response.status_code} {response.text}\n"
-            )
-        raise Exception(
-            f"Error getting the price change for {symbol} in the window {window}: {response.status_code} {response.text}"
-        )
-    else:
-        data = response.json()
-        price_change = data["priceChange"]
-        price_change_percent = data["priceChangePercent"]
-        with open(LOG_FILE, "a") as f:
-            f.write(
-                f"{datetime.datetime.now()}: Successfully got the price change for {symbol} in the window {window}: {price_change} ({price_change_percent}%)\n"
-            )
-    return data
+register_price_tools(mcp, _SYMBOLS, log_activity)
 
 
 if __name__ == "__main__":
@@ -1,79 +1,62 @@
-import datetime
+import asyncio
 from fastmcp import FastMCP
-import requests
-from typing import Any
+import time
 from collections import deque
+from itertools import islice, starmap
 import logging
 
-# In-memory logging for cloud deployment
-_activity_logs = deque(maxlen=1000)  # Keep last 1000 log entries
-
-# Initialize symbol mappings in memory (no local files needed)
-SYMBOL_MAPPINGS = {
-    "btc": "BTCUSDT",
-    "bitcoin": "BTCUSDT",
-    "eth": "ETHUSDT",
-    "ethereum": "ETHUSDT",
-    "sol": "SOLUSDT",
-    "solana": "SOLUSDT",
-    "doge": "DOGEUSDT",
-    "shiba": "SHIBUSDT",
-    "xrp": "XRPUSDT",
-    "ada": "ADAUSDT",
-    "dot": "DOTUSDT",
-    "link": "LINKUSDT",
-    "ltc": "LTCUSDT",
-    "xlm": "XLMUSDT",
-    "eos": "EOSUSDT",
-    "bnb": "BNBUSDT",
-    "matic": "MATICUSDT",
-    "avax": "AVAXUSDT",
-    "algo": "ALGOUSDT",
-    "ftt": "FTTUSDT",
-    "mana": "MANAUSDT",
-    "uni": "UNIUSDT",
-    "xmr": "XMRUSDT",
-    "xem": "XEMUSDT",
-}
+from binance_api import (
+    SYMBOL_MAPPINGS,
+    log_timestamp,
+    register_price_tools,
+    symbol_map_csv,
+)
+
+# In-memory logging for cloud deployment: timestamps and messages are kept in
+# parallel deques so entries stay compact until they are formatted for reading
+LOG_MAX_ENTRIES = 1000  # Keep last 1000 log entries
+_log_ts = deque(maxlen=LOG_MAX_ENTRIES)
+_log_msg = deque(maxlen=LOG_MAX_ENTRIES)
+
+# The mappings never change at runtime, so the CSV resource is rendered once
+_SYMBOL_MAP_CSV = symbol_map_csv(SYMBOL_MAPPINGS)
 
 mcp = FastMCP("binance-mcp")
 
 
 def log_activity(message: str):
     """Log activity to in-memory deque instead of file"""
-    timestamp = datetime.datetime.now().isoformat()
-    log_entry = f"{timestamp}: {message}"
-    _activity_logs.append(log_entry)
+    # Store the raw timestamp; it is only formatted when the logs are read
+    _log_ts.append(time.time_ns())
+    _log_msg.append(message)
     # Also log to console for debugging
-    logging.info(log_entry)
+    logging.info(message)
 
 
-def get_symbol_from_input(name: str) -> str:
-    """Get symbol from input name using in-memory mappings"""
-    return SYMBOL_MAPPINGS.get(name.lower(), name.upper())
+def _format_log_entry(timestamp_ns: int, message: str) -> str:
+    """Format a log entry as an ISO timestamped line"""
+    return f"{log_timestamp(timestamp_ns).isoformat()}: {message}"
 
 
 @mcp.resource("memory://symbol_map")
 def get_symbol_map() -> str:
     """Get symbol mappings as CSV format from memory"""
-    csv_content = "crypto_name,symbol\n"
-    for crypto_name, symbol in SYMBOL_MAPPINGS.items():
-        csv_content += f"{crypto_name},{symbol}\n"
-    return csv_content
+    return _SYMBOL_MAP_CSV
 
 
 @mcp.resource("memory://activity_log")
 def read_log() -> str:
     """Get recent activity logs from memory"""
-    return "\n".join(_activity_logs)
+    return "\n".join(map(_format_log_entry, _log_ts, _log_msg))
 
 
 @mcp.tool()
 def get_recent_logs(limit: int = 50) -> str:
     """Get recent activity logs (limit: 1-100)"""
     limit = max(1, min(limit, 100))  # Clamp between 1-100
-    recent_logs = list(_activity_logs)[-limit:]
-    return "\n".join(recent_logs)
+    skip = max(0, len(_log_msg) - limit)
+    recent_logs = islice(zip(_log_ts, _log_msg), skip, None)
+    return "\n".join(starmap(_format_log_entry, recent_logs))
 
 
 @mcp.prompt()
@@ -115,105 +98,18 @@ def crypto_summary(cryptos: str) -> str:
             """
 
 
-# https://github.com/modelcontextprotocol/python-sdk?tab=readme-ov-file#resources
-# example: resource://crypto_price/BTCUSDT
-@mcp.resource("resource://crypto_price/{symbol}")
-def get_crypto_price(symbol: str) -> str:
-    """
-    Get the current price of a crypto asset from Binance
-    """
-    return get_price(symbol)
-
-
-@mcp.tool()
-def get_price(symbol: str) -> Any:
-    """
-    Get the current price of a crypto asset from Binance
-
-    Args:
-        symbol(str): The symbol of the crypto asset to get the price of
-
-    Returns:
-        The current price of the crypto asset
-    """
-    symbol = get_symbol_from_input(symbol)
-    url = f"https://api.binance.us/api/v3/ticker/price?symbol={symbol}"
-    response = requests.get(url)
-    if response.status_code != 200:
-        log_activity(
-            f"Error getting price for {symbol}: {response.status_code} {response.text}"
-        )
-        raise Exception(
-            f"Error getting price for {symbol}: {response.status_code} {response.text}"
-        )
-    else:
-        price = response.json()["price"]
-        log_activity(f"Successfully got the current price for {symbol}: {price}")
-    return f"The current price of {symbol} is {price}"
+register_price_tools(mcp, SYMBOL_MAPPINGS, log_activity)
 
 
-@mcp.tool()
-def get_price_24hr_change(symbol: str) -> Any:
-    """
-    Get the price change of a crypto asset from Binance
-
-    Args:
-        symbol(str): The symbol of the crypto asset to get the price change of
-    """
-    symbol = get_symbol_from_input(symbol)
-    url = f"https://api.binance.us/api/v3/ticker/24hr?symbol={symbol}"
-    response = requests.get(url)
-    if response.status_code != 200:
-        log_activity(
-            f"Error getting price change for {symbol}: {response.status_code} {response.text}"
-        )
-        raise Exception(
-            f"Error getting price change for {symbol}: {response.status_code} {response.text}"
-        )
-    else:
-        data = response.json()
-        price_change = data["priceChange"]
-        price_change_percent = data["priceChangePercent"]
-
-        log_activity(
-            f"Successfully got the price change for {symbol}: {price_change} ({price_change_percent}%)"
-        )
-    return data
-
-
-@mcp.tool()
-def get_rolling_windows_price(symbol: str, window: str = "1d") -> Any:
-    """
-    Get the rolling windows price of a crypto asset from Binance
-
-    Args:
-        symbol(str): The symbol of the crypto asset to get the rolling windows price of
-        window(str): The window size of the rolling windows price
-            - Minutes: 1m, 2m, ..., 59m
-            - Hours: 1h, 2h, ..., 23h
-            - Days: 1d, 2d, ..., 7d
-    """
-    symbol = get_symbol_from_input(symbol)
-    url = f"https://api.binance.us/api/v3/ticker?symbol={symbol}&windowSize={window}"
-    response = requests.get(url)
-    if response.status_code != 200:
-        log_activity(
-            f"Error getting the price change for {symbol} in the window {window}: {response.status_code} {response.text}"
-        )
-        raise Exception(
-            f"Error getting the price change for {symbol} in the window {window}: {response.status_code} {response.text}"
-        )
+if __name__ == "__main__":
+    # libuv-based event loop for the HTTP server (uvloop does not support Windows)
+    try:
+        import uvloop
+    except ImportError:
+        pass
     else:
-        data = response.json()
-        price_change = data["priceChange"]
-        price_change_percent = data["priceChangePercent"]
-        log_activity(
-            f"Successfully got the price change for {symbol} in the window {window}: {price_change} ({price_change_percent}%)"
-        )
-    return data
-
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
-if __name__ == "__main__":
     # Streamable HTTP protocol - optimized for cloud deployment
     mcp.run(
         transport="http",
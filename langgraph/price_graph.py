@@ -1,28 +1,32 @@
 import asyncio
+from contextlib import AsyncExitStack
+from functools import cache
 from pathlib import Path
 from dotenv import load_dotenv
-from langchain_core.messages import HumanMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_mcp_adapters.client import MultiServerMCPClient
-from langgraph.prebuilt import create_react_agent
 
 import os
-from pydantic import SecretStr
 
 # load .env file
 load_dotenv(verbose=True)
 
-# Get API key and validate it exists
-api_key = os.getenv("GEMINI_API_KEY")
-if not api_key:
-    raise ValueError("GEMINI_API_KEY environment variable is not set")
 
-# temperature: 0.0 ~ 1.0
-model = ChatGoogleGenerativeAI(
-    model="gemini-1.5-flash",
-    temperature=0.0,
-    api_key=SecretStr(api_key),
-)
+# LangChain / Google SDK imports are deferred until the model is first needed
+@cache
+def get_model():
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    from pydantic import SecretStr
+
+    # Get API key and validate it exists
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY environment variable is not set")
+
+    # temperature: 0.0 ~ 1.0
+    return ChatGoogleGenerativeAI(
+        model="gemini-1.5-flash",
+        temperature=0.0,
+        api_key=SecretStr(api_key),
+    )
 
 
 ROOT_FOLDER = Path(__file__).parent.parent.absolute()
@@ -37,19 +41,68 @@ mcp_config = {
 }
 
 
-async def get_crypto_price():
-    async with MultiServerMCPClient(mcp_config) as client:
+# The MCP client (and its stdio server subprocess) is started once and reused
+_exit_stack = AsyncExitStack()
+_agent = None
+
+
+async def startup():
+    """Start the MCP server and build the agent (call once, from the main task)"""
+    global _agent
+    if _agent is None:
+        from langchain_mcp_adapters.client import MultiServerMCPClient
+        from langgraph.prebuilt import create_react_agent
+
+        # build the model first so a missing API key fails before the server starts
+        model = get_model()
+        client = await _exit_stack.enter_async_context(MultiServerMCPClient(mcp_config))
         tools = client.get_tools()
-        agent = create_react_agent(model=model, tools=tools)
-        # create a message
-        question = f"What are the current price of Bitcoin and Ethereum?"
-        messages = HumanMessage(content=question)
-        # send the message to the model and get the response
-        response = await agent.ainvoke({"messages": [messages]})
-        answer = response["messages"][-1].content
-        return answer
+        _agent = create_react_agent(model=model, tools=tools)
+    return _agent
+
+
+async def shutdown():
+    """Stop the MCP server started by startup()"""
+    global _agent
+    await _exit_stack.aclose()
+    _agent = None
+
+
+async def ask(question: str) -> str:
+    """Answer a question with the running agent (requires startup())"""
+    from langchain_core.messages import HumanMessage
+
+    # startup() is not called lazily here: concurrent callers would race to start
+    # the server, and the exit stack must be entered from the task that closes it
+    if _agent is None:
+        raise RuntimeError("startup() must be awaited before ask()")
+    # create a message
+    messages = HumanMessage(content=question)
+    # send the message to the model and get the response
+    response = await _agent.ainvoke({"messages": [messages]})
+    answer = response["messages"][-1].content
+    return answer
+
+
+async def ask_many(questions: list[str]) -> list[str]:
+    """Answer several questions concurrently (requires startup())"""
+    # questions share the running MCP server and are answered concurrently
+    return await asyncio.gather(*(ask(question) for question in questions))
+
+
+async def get_crypto_price():
+    question = f"What are the current price of Bitcoin and Ethereum?"
+    return await ask(question)
+
+
+async def main():
+    await startup()
+    try:
+        return await get_crypto_price()
+    finally:
+        await shutdown()
 
 
 if __name__ == "__main__":
-    response = asyncio.run(get_crypto_price())
+    response = asyncio.run(main())
     print(response)